@@ -16,13 +16,114 @@ Key approach:
 
 import asyncio
 import logging
-from typing import Optional, Tuple
+import os
+import re
+import socket
+import sys
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from chuk_protocol_server.handlers.telnet_handler import TelnetHandler
 
 logger = logging.getLogger('telnet-proxy-server')
 
-active_telnet_targets = {}  # Mapping: target string -> count of clients using it
+# Mapping: target string -> count of clients using it. Only touched from the event loop,
+# so it needs no lock (it is not safe to share across threads).
+active_telnet_targets: Dict[str, int] = {}
+
+DEFAULT_READ_SIZE = 65536
+MAX_READ_SIZE = 1024 * 1024
+
+def _read_size_from_env() -> int:
+    """
+    Read TELNET_READ_BUFFER, falling back to DEFAULT_READ_SIZE (with a warning)
+    if it is not a positive integer and clamping it to MAX_READ_SIZE.
+    A bad value must not stop the module importing.
+    """
+    raw = os.getenv("TELNET_READ_BUFFER")
+    if raw is None:
+        return DEFAULT_READ_SIZE
+    try:
+        size = int(raw)
+    except ValueError:
+        size = 0
+    if size < 1:
+        logger.warning("Ignoring TELNET_READ_BUFFER=%r (must be a positive integer); using %d",
+                       raw, DEFAULT_READ_SIZE)
+        return DEFAULT_READ_SIZE
+    if size > MAX_READ_SIZE:
+        logger.warning("TELNET_READ_BUFFER=%d is above the %d maximum; using %d",
+                       size, MAX_READ_SIZE, MAX_READ_SIZE)
+        return MAX_READ_SIZE
+    return size
+
+# Read size for target -> client forwarding; larger reads mean fewer syscalls and WS frames.
+# Override with TELNET_READ_BUFFER; beyond ~64 KiB returns diminish.
+TARGET_READ_SIZE = _read_size_from_env()
+# Kernel receive buffer for the target socket, sized so 64 KiB reads can actually fill
+TARGET_SO_RCVBUF = 262144
+
+# Client -> target bytes queued while the target socket is backed up; past this many
+# bytes the inbound loop waits for the flush instead of queueing more
+INBOUND_FLUSH_THRESHOLD = 16384
+# Flush queued chunks with one vectored sendmsg() instead of joining them first.
+# Needs a selector-style loop (add_writer), so it is off on Windows.
+_USE_SENDMSG = sys.platform != 'win32' and hasattr(socket.socket, 'sendmsg')
+SENDMSG_MAX_BUFFERS = 1024  # stay within the kernel's IOV_MAX
+
+# Resolved addresses per (host, port), reused for DNS_CACHE_TTL seconds: (expires_at, addrinfo list)
+DNS_CACHE_TTL = 60.0
+DNS_CACHE_SIZE = 1024
+_dns_cache: Dict[Tuple[str, int], Tuple[float, List[tuple]]] = {}
+
+# "/ws/host/port" (extra slashes tolerated), matched in one pass instead of strip + split
+SUBPATH_PREFIX = "/ws"
+_SUBPATH_RE = re.compile(r'^/ws/*([^/]+)/([^/]+)/*$')
+
+# Where the request path can live on a websocket, in order of preference. The first
+# getter that works is cached in _path_getter, since it is the same for every connection.
+_PATH_GETTERS: Tuple[Tuple[str, Callable[[Any], Optional[str]]], ...] = (
+    ("websocket._original_path", lambda ws: ws._original_path),
+    ("websocket.full_path", lambda ws: ws.full_path),
+    ("websocket.request.path", lambda ws: ws.request.path),
+)
+_path_getter: Optional[Tuple[str, Callable[[Any], Optional[str]]]] = None
+
+# LRU cache of (raw_path, default_target) -> (host, port) for subpath/default parsing.
+# Handlers all run on one event loop, so no lock is needed.
+PARSE_CACHE_SIZE = 1024
+_parse_cache: "OrderedDict[Tuple[Optional[str], Optional[str]], Tuple[Optional[str], Optional[int]]]" = OrderedDict()
+
+def split_target(target: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """Split a "host:port" target string into (host, port)."""
+    if not target:
+        return None, None
+
+    try:
+        host, port_str = target.split(':', 1)
+        port_val = int(port_str)
+        logger.info("Final target parse: host='%s', port='%s' from target='%s'", host, port_val, target)
+        return host, port_val
+    except Exception as e:
+        logger.error("Invalid target format '%s': %s", target, e)
+        return None, None
+
+def set_low_latency(sock: socket.socket) -> None:
+    """
+    Disable Nagle's algorithm (and, on Linux, delayed ACKs) on a TCP socket,
+    so small interactive writes go out immediately.
+    """
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    if hasattr(socket, 'TCP_QUICKACK'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+def build_path_targets(path_mappings: Dict[str, str]) -> Dict[str, Tuple[Optional[str], Optional[int]]]:
+    """
+    Pre-split path mappings ("path" -> "host:port") into "path" -> (host, port).
+    Done once at server startup so a mapped connect is a single dict lookup.
+    """
+    return {path: split_target(target) for path, target in path_mappings.items()}
 
 class TelnetProxyHandler(TelnetHandler):
     """
@@ -35,11 +136,19 @@ class TelnetProxyHandler(TelnetHandler):
         super().__init__(*args, **kwargs)
         self.target_host: Optional[str] = None
         self.target_port: Optional[int] = None
-        self.target_reader: Optional[asyncio.StreamReader] = None
-        self.target_writer: Optional[asyncio.StreamWriter] = None
+        # Raw non-blocking socket to the target, driven with loop.sock_* calls
+        self.target_sock: Optional[socket.socket] = None
         self.forwarding_task: Optional[asyncio.Task] = None
+        # Client close handshake started when the target ends first (referenced so it is not GC'd)
+        self._ws_close_task: Optional[asyncio.Task] = None
+        # Client -> target chunks waiting on a backed-up target socket, and the task flushing them
+        self._outbound: deque = deque()
+        self._outbound_size = 0
+        self._flush_task: Optional[asyncio.Task] = None
         self.target_connection_string: Optional[str] = None
         self._reading = False
+        # Client send function, picked once in on_connect (websocket.send or send_raw)
+        self._send_impl = self.send_raw
         # Will be set by the server (via the adapter) for WebSocket path parsing
         self.websocket_path: Optional[str] = None
 
@@ -47,19 +156,26 @@ class TelnetProxyHandler(TelnetHandler):
         """
         Extract the WebSocket path from the websocket object.
         The chuk_protocol_server adapter often sets _original_path or full_path.
+        The location that worked is remembered, so later connections try it first.
         """
+        global _path_getter
         if hasattr(self, 'websocket'):
-            if hasattr(self.websocket, '_original_path'):
-                p = self.websocket._original_path
-                logger.debug(f"Found path in websocket._original_path: {p}")
-                return p
-            if hasattr(self.websocket, 'full_path'):
-                p = self.websocket.full_path
-                logger.debug(f"Found path in websocket.full_path: {p}")
-                return p
-            if hasattr(self.websocket, 'request') and hasattr(self.websocket.request, 'path'):
-                p = self.websocket.request.path
-                logger.debug(f"Found path in websocket.request.path: {p}")
+            ws = self.websocket
+            if _path_getter is not None:
+                name, getter = _path_getter
+                try:
+                    p = getter(ws)
+                    logger.debug("Found path in %s: %s", name, p)
+                    return p
+                except AttributeError:
+                    pass  # a different kind of websocket object; probe all locations below
+            for name, getter in _PATH_GETTERS:
+                try:
+                    p = getter(ws)
+                except AttributeError:
+                    continue
+                _path_getter = (name, getter)
+                logger.debug("Found path in %s: %s", name, p)
                 return p
         logger.debug("Could not find WebSocket path in any location")
         return None
@@ -71,41 +187,40 @@ class TelnetProxyHandler(TelnetHandler):
         """
         if hasattr(self, 'websocket'):
             self.websocket_path = self._extract_websocket_path()
-            logger.debug(f"Proxy handler captured websocket path: {self.websocket_path}")
+            logger.debug("Proxy handler captured websocket path: %s", self.websocket_path)
 
         await self.on_connect()
 
         # If we're in WS mode, read inbound data from the client, forward to target
         if hasattr(self, 'websocket'):
+            forward = self._forward_inbound_bytes
             try:
                 async for message in self.websocket:
-                    # If it's text, encode it to bytes
-                    if isinstance(message, str):
-                        data = message.encode('utf-8', errors='replace')
-                    else:
-                        data = message  # already bytes
-                    await self._forward_inbound_bytes(data)
+                    # Text frames are encoded to bytes; binary frames pass through untouched
+                    if type(message) is str:
+                        message = message.encode('utf-8', 'replace')
+                    await forward(message)
             except Exception as e:
-                logger.exception(f"Error processing WebSocket messages: {e}")
+                logger.exception("Error processing WebSocket messages: %s", e)
             finally:
                 await self.on_close()
 
     async def on_connect(self) -> None:
         """Called when a new client connects. Parse path -> connect to target."""
-        logger.info(f"New connection from {self.addr}")
+        logger.info("New connection from %s", self.addr)
 
         # If not already set, attempt extraction again
         if not self.websocket_path:
             self.websocket_path = self._extract_websocket_path()
-            logger.debug(f"on_connect: extracted websocket path: {self.websocket_path}")
+            logger.debug("on_connect: extracted websocket path: %s", self.websocket_path)
 
         # Fallback: if still not set, try getting from .handler.websocket
         if not self.websocket_path and hasattr(self, 'handler') and hasattr(self.handler, 'websocket'):
             try:
                 self.websocket_path = self.handler.websocket.request.path
-                logger.debug(f"on_connect: set websocket path from handler: {self.websocket_path}")
+                logger.debug("on_connect: set websocket path from handler: %s", self.websocket_path)
             except Exception as ex:
-                logger.error(f"on_connect: could not extract websocket path from handler: {ex}")
+                logger.error("on_connect: could not extract websocket path from handler: %s", ex)
 
         default_target = getattr(self.server, 'default_target', None)
         self.target_host, self.target_port = self._parse_target(default_target)
@@ -116,152 +231,338 @@ class TelnetProxyHandler(TelnetHandler):
             return
 
         self.target_connection_string = f"{self.target_host}:{self.target_port}"
-        logger.info(f"Connecting to {self.target_connection_string}")
+        logger.info("Connecting to %s", self.target_connection_string)
         if not await self._connect_to_target():
             await self.end_session()
             return
 
+        # Pick the client send path once instead of probing for a websocket per packet
+        if hasattr(self, 'websocket'):
+            self._send_impl = self.websocket.send
+            self._tune_client_socket()
+
         # Start reading from target -> client
         self.forwarding_task = asyncio.create_task(self._forward_from_target())
 
+    def _tune_client_socket(self) -> None:
+        """Make sure the WebSocket client's TCP socket also has Nagle disabled."""
+        try:
+            sock = self.websocket.transport.get_extra_info('socket')
+            if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+                set_low_latency(sock)
+        except Exception as e:
+            logger.debug("Could not set TCP options on WebSocket socket: %s", e)
+
     def _parse_target(self, default_target: Optional[str] = None) -> Tuple[Optional[str], Optional[int]]:
         """
+        If raw_path matches a path mapping, use it.
         If raw_path starts with "/ws", parse remainder as "host/port".
         Otherwise, fallback to default_target.
+        Subpath/default results are memoized per (raw_path, default_target).
         """
         raw_path = self.websocket_path
-        logger.debug(f"_parse_target => raw_path='{raw_path}', default_target='{default_target}'")
-        target = None
-
-        # If the server has path_mappings, check them
-        path_mappings = getattr(self.server, 'path_mappings', {})
+        logger.debug("_parse_target => raw_path='%s', default_target='%s'", raw_path, default_target)
 
-        if raw_path and raw_path in path_mappings:
-            target = path_mappings[raw_path]
-            logger.debug(f"Matched path mapping: {raw_path} => {target}")
+        # Path mappings pre-split at startup (see build_path_targets) take priority
+        path_targets = getattr(self.server, 'path_targets', None)
+        if path_targets is not None:
+            if raw_path and raw_path in path_targets:
+                logger.debug("Matched path mapping: %s => %s", raw_path, path_targets[raw_path])
+                return path_targets[raw_path]
         else:
-            SUBPATH_PREFIX = "/ws"
-            if raw_path and raw_path.startswith(SUBPATH_PREFIX):
-                remainder = raw_path[len(SUBPATH_PREFIX):].strip('/')
-                logger.debug(f"Subpath remainder: '{remainder}'")
-                parts = remainder.split('/')
-                if len(parts) == 2:
-                    host_part, port_part = parts
-                    try:
-                        port_val = int(port_part)
-                        target = f"{host_part}:{port_val}"
-                        logger.debug(f"Parsed target from subpath: {target}")
-                    except ValueError:
-                        logger.warning(f"Could not parse port from subpath: '{port_part}'")
-                else:
-                    logger.debug(f"Not enough parts in subpath remainder: '{remainder}'")
+            # Servers not started via start_server (e.g. YAML config) only carry path_mappings
+            path_mappings = getattr(self.server, 'path_mappings', {})
+            if raw_path and raw_path in path_mappings:
+                target = path_mappings[raw_path]
+                logger.debug("Matched path mapping: %s => %s", raw_path, target)
+                return split_target(target)
+
+        key = (raw_path, default_target)
+        cached = _parse_cache.get(key)
+        if cached is not None:
+            _parse_cache.move_to_end(key)
+            return cached
+
+        result = self._parse_subpath_or_default(raw_path, default_target)
+        _parse_cache[key] = result
+        if len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+        return result
+
+    def _parse_subpath_or_default(self, raw_path: Optional[str],
+                                  default_target: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+        """Parse "/ws/host/port" from raw_path, falling back to default_target."""
+        target = None
+        match = _SUBPATH_RE.match(raw_path) if raw_path else None
+        if match:
+            host_part, port_part = match.groups()
+            try:
+                port_val = int(port_part)
+                target = f"{host_part}:{port_val}"
+                logger.debug("Parsed target from subpath: %s", target)
+            except ValueError:
+                logger.warning("Could not parse port from subpath: '%s'", port_part)
+        elif raw_path and raw_path.startswith(SUBPATH_PREFIX):
+            logger.debug("Subpath is not of the form host/port: '%s'", raw_path)
 
         if not target:
-            logger.debug(f"No subpath found; fallback to default_target: {default_target}")
+            logger.debug("No subpath found; fallback to default_target: %s", default_target)
             target = default_target
 
-        if not target:
-            return None, None
-
-        # Split into host, port
-        try:
-            host, port_str = target.split(':', 1)
-            port_val = int(port_str)
-            logger.info(f"Final target parse: host='{host}', port='{port_val}' from target='{target}'")
-            return host, port_val
-        except Exception as e:
-            logger.error(f"Invalid target format '{target}': {e}")
-            return None, None
+        return split_target(target)
 
     async def _connect_to_target(self) -> bool:
         """Open a TCP connection to the chosen telnet server."""
         try:
-            self.target_reader, self.target_writer = await asyncio.open_connection(
-                self.target_host, self.target_port
-            )
-            logger.info(f"Connected to {self.target_connection_string}")
+            self.target_sock = await self._open_target_socket()
+            logger.info("Connected to %s", self.target_connection_string)
             self._update_target_stats(self.target_connection_string, +1)
             return True
         except Exception as e:
-            logger.error(f"Error connecting to {self.target_connection_string}: {e}")
+            logger.error("Error connecting to %s: %s", self.target_connection_string, e)
             return False
 
+    async def _open_target_socket(self) -> socket.socket:
+        """
+        Resolve the target and connect a non-blocking socket to the first
+        address that accepts. The socket is owned by this handler and read
+        with loop.sock_recv, so no StreamReader/transport sits on top.
+        """
+        loop = asyncio.get_running_loop()
+        infos = await self._resolve_target(loop)
+        last_error: Optional[Exception] = None
+        for family, sock_type, proto, _, sockaddr in infos:
+            sock = socket.socket(family, sock_type, proto)
+            try:
+                sock.setblocking(False)
+                # asyncio transports set TCP_NODELAY for us; raw sockets need it explicitly
+                set_low_latency(sock)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, TARGET_SO_RCVBUF)
+                await loop.sock_connect(sock, sockaddr)
+                return sock
+            except OSError as e:
+                sock.close()
+                last_error = e
+            except BaseException:
+                sock.close()
+                raise
+        # Every address failed; drop the cached resolution so the next attempt looks it up again
+        _dns_cache.pop((self.target_host, self.target_port), None)
+        raise last_error or OSError(f"No addresses found for {self.target_connection_string}")
+
+    async def _resolve_target(self, loop: asyncio.AbstractEventLoop) -> List[tuple]:
+        """Resolve the target via getaddrinfo, reusing a cached result within DNS_CACHE_TTL."""
+        key = (self.target_host, self.target_port)
+        now = loop.time()
+        cached = _dns_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        infos = await loop.getaddrinfo(self.target_host, self.target_port, type=socket.SOCK_STREAM)
+        _dns_cache.pop(key, None)
+        if len(_dns_cache) >= DNS_CACHE_SIZE:
+            # Targets come from client paths, so bound the cache; evict the oldest entry
+            _dns_cache.pop(next(iter(_dns_cache)))
+        _dns_cache[key] = (now + DNS_CACHE_TTL, infos)
+        return infos
+
     async def _forward_inbound_bytes(self, data: bytes) -> None:
         """
         Send raw inbound data from the client to the target telnet server.
+        Messages go straight to the socket while it keeps up; once it backs up,
+        later messages are queued and flushed together.
         """
-        if self.target_writer:
+        if not data:
+            return  # nothing to forward; queued, an empty chunk would never drain
+        if self.target_sock:
             try:
-                self.target_writer.write(data)
-                await self.target_writer.drain()
+                if self._outbound:
+                    # A flush is in progress: queue behind it, and only wait once enough piles up
+                    self._outbound.append(data)
+                    self._outbound_size += len(data)
+                    if self._outbound_size >= INBOUND_FLUSH_THRESHOLD:
+                        # wait() neither cancels the flush nor re-raises its cancellation, which
+                        # happens when the target closes while the backlog drains
+                        await asyncio.wait((self._flush_task,))
+                    return
+                try:
+                    sent = self.target_sock.send(data)
+                except BlockingIOError:
+                    sent = 0
+                if sent < len(data):
+                    self._outbound.append(memoryview(data)[sent:])
+                    self._outbound_size = len(data) - sent
+                    self._flush_task = asyncio.create_task(self._flush_outbound())
             except Exception as e:
-                logger.error(f"Error forwarding inbound data: {e}")
+                logger.error("Error forwarding inbound data: %s", e)
                 await self.end_session()
 
+    async def _flush_outbound(self) -> None:
+        """Send queued client -> target chunks, picking up anything queued meanwhile."""
+        loop = asyncio.get_running_loop()
+        sock = self.target_sock
+        outbound = self._outbound
+        try:
+            if not _USE_SENDMSG:
+                while outbound:
+                    # The joined chunk stays queued until it is fully sent, so messages arriving
+                    # meanwhile queue behind it instead of going to the socket mid-send
+                    chunk = b"".join(outbound)
+                    outbound.clear()
+                    outbound.append(chunk)
+                    await loop.sock_sendall(sock, chunk)
+                    outbound.popleft()
+                    self._outbound_size -= len(chunk)
+                return
+            while outbound:
+                # The socket was full when queueing started, so wait for room before each send
+                await self._wait_writable(loop, sock)
+                try:
+                    sent = sock.sendmsg(islice(outbound, SENDMSG_MAX_BUFFERS))
+                except BlockingIOError:
+                    continue
+                self._outbound_size -= sent
+                # Drop fully sent (and zero-length) chunks, then trim a partially sent one
+                while outbound and sent >= len(outbound[0]):
+                    sent -= len(outbound.popleft())
+                if sent:
+                    outbound[0] = memoryview(outbound[0])[sent:]
+        except asyncio.CancelledError:
+            outbound.clear()
+            raise
+        except Exception as e:
+            outbound.clear()
+            logger.error("Error forwarding inbound data: %s", e)
+            await self.end_session()
+        finally:
+            if not outbound:
+                self._outbound_size = 0
+
+    @staticmethod
+    async def _wait_writable(loop: asyncio.AbstractEventLoop, sock: socket.socket) -> None:
+        """Wait until the socket can accept more data."""
+        waiter = loop.create_future()
+
+        def _on_writable() -> None:
+            if not waiter.done():
+                waiter.set_result(None)
+
+        loop.add_writer(sock, _on_writable)
+        try:
+            await waiter
+        finally:
+            loop.remove_writer(sock)
+
     async def _forward_from_target(self) -> None:
-        """Continuously read data from target -> send to the client."""
+        """
+        Continuously read data from target -> send to the client.
+        Sends are pipelined one deep: the next chunk is read while the previous
+        one is still being sent, and sends are always awaited in order.
+        """
+        # Everything the loop touches is bound to locals up front (LOAD_FAST, not global/attr lookups)
+        loop = asyncio.get_running_loop()
+        sock = self.target_sock
+        recv = loop.sock_recv
+        read_size = TARGET_READ_SIZE
+        spawn = loop.create_task
+        send = self._send_impl
+        cancelled = False
+        # The send in flight; it is awaited before the next one starts
+        pending_send: Optional[asyncio.Task] = None
         try:
             while True:
-                data = await self.target_reader.read(1024)
+                # sock_recv allocates only once data is ready, so idle sessions hold no buffer
+                data = await recv(sock, read_size)
+                if pending_send is not None:
+                    # Never more than one send outstanding, so frames stay in order
+                    await pending_send
+                    pending_send = None
                 if not data:
-                    logger.info(f"Target {self.target_connection_string} closed connection")
+                    logger.info("Target %s closed connection", self.target_connection_string)
                     break
-                await self.send_bytes(data)
+                pending_send = spawn(send(data))
         except asyncio.CancelledError:
-            logger.info(f"Forwarding cancelled for {self.target_connection_string}")
+            cancelled = True
+            logger.info("Forwarding cancelled for %s", self.target_connection_string)
         except Exception as e:
-            logger.error(f"Error in target read loop: {e}")
+            logger.error("Error in target read loop: %s", e)
         finally:
+            if pending_send is not None:
+                if not pending_send.done():
+                    pending_send.cancel()
+                elif not pending_send.cancelled():
+                    pending_send.exception()  # retrieved here; the loop is already exiting
             await self.end_session()
+            if not cancelled:
+                # The target side ended first: release it now, then close the client so the
+                # receive loop in handle_client finishes instead of idling until the client
+                # hangs up. on_close cancels this task, so the close handshake runs in its own.
+                await self._close_target_connection()
+                if hasattr(self, 'websocket'):
+                    self._ws_close_task = asyncio.create_task(
+                        self._close_websocket("Target closed connection"))
+
+    async def _close_websocket(self, reason: str) -> None:
+        """Close the client WebSocket normally with the given reason."""
+        try:
+            await self.websocket.close(1000, reason)
+        except Exception as e:
+            logger.error("Error closing WebSocket after target closed: %s", e)
 
     async def send_bytes(self, data: bytes) -> None:
         """
-        Send raw bytes to the client (via websocket if available, else fallback).
+        Send raw bytes to the client: a binary WS frame when a websocket is attached,
+        otherwise unchanged on the raw stream (no decode, no CRLF).
         """
-        if hasattr(self, 'websocket'):
-            # Send binary data as a WS frame
-            await self.websocket.send(data)
-        else:
-            # If not using WebSocket, we can decode for a normal telnet send
-            try:
-                text = data.decode('utf-8', errors='replace')
-            except Exception:
-                text = repr(data)
-            await self.send_line(text)
+        await self._send_impl(data)
 
     async def on_close(self) -> None:
         """Clean up resources when the client disconnects."""
-        logger.info(f"Client {self.addr} disconnected")
-        if self.forwarding_task:
-            self.forwarding_task.cancel()
-            try:
-                await self.forwarding_task
-            except Exception as e:
-                logger.error(f"Error cancelling forwarding task: {e}")
-        await self._close_target_connection()
+        logger.info("Client %s disconnected", self.addr)
+        try:
+            if self.forwarding_task:
+                self.forwarding_task.cancel()
+                try:
+                    await self.forwarding_task
+                except asyncio.CancelledError:
+                    # Expected from the task we just cancelled; re-raise only if on_close itself was
+                    if asyncio.current_task().cancelling():
+                        raise
+                except Exception as e:
+                    logger.error("Error cancelling forwarding task: %s", e)
+        finally:
+            await self._close_target_connection()
 
     async def _close_target_connection(self) -> None:
         """Close the connection to the target telnet server."""
-        if self.target_writer:
-            try:
-                self.target_writer.close()
-                await self.target_writer.wait_closed()
-                logger.info(f"Closed connection to {self.target_connection_string}")
-                self._update_target_stats(self.target_connection_string, -1)
-            except Exception as e:
-                logger.error(f"Error closing target connection: {e}")
-        self.target_reader = None
-        self.target_writer = None
+        # Detach first so a concurrent call cannot close or count the same socket twice
+        sock, self.target_sock = self.target_sock, None
+        flush_task, self._flush_task = self._flush_task, None
+        try:
+            if flush_task and not flush_task.done():
+                # Let the flush unregister its writer before the fd is closed and can be reused
+                flush_task.cancel()
+                try:
+                    await flush_task
+                except asyncio.CancelledError:
+                    if asyncio.current_task().cancelling():
+                        raise
+        finally:
+            if sock:
+                try:
+                    sock.close()
+                    logger.info("Closed connection to %s", self.target_connection_string)
+                    self._update_target_stats(self.target_connection_string, -1)
+                except Exception as e:
+                    logger.error("Error closing target connection: %s", e)
 
     def _update_target_stats(self, target: str, delta: int) -> None:
         """Update the global dictionary of active targets."""
-        global active_telnet_targets
         if not target:
             return
-        if target in active_telnet_targets:
-            active_telnet_targets[target] += delta
-            if active_telnet_targets[target] <= 0:
-                del active_telnet_targets[target]
-        elif delta > 0:
-            active_telnet_targets[target] = delta
-        logger.info(f"Active telnet targets: {active_telnet_targets}")
\ No newline at end of file
+        count = active_telnet_targets.get(target, 0) + delta
+        if count > 0:
+            active_telnet_targets[target] = count
+        else:
+            active_telnet_targets.pop(target, None)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Active telnet targets: %r", active_telnet_targets)
@@ -7,15 +7,11 @@ Forces DEBUG-level logs to help debug subpath vs. default target issues.
 import asyncio
 import logging
 import argparse
+import sys
 from typing import Optional, Dict
 
-# Imports from chuk_protocol_server
-from chuk_protocol_server.servers.telnet_server import TelnetServer
-from chuk_protocol_server.servers.tcp_server import TCPServer
-from chuk_protocol_server.servers.ws_server_plain import PlainWebSocketServer
-from chuk_protocol_server.servers.ws_telnet_server import WSTelnetServer
-
-from telnet_proxy_server.proxy_handler import TelnetProxyHandler
+# chuk_protocol_server (and websockets behind it) is imported inside start_server,
+# so `--help` and argument errors exit without loading the server stack.
 
 logger = logging.getLogger('telnet-proxy-main')
 
@@ -98,6 +94,14 @@ def parse_path_mappings(mappings_list):
 
 async def start_server(args):
     """Start the appropriate server based on protocol."""
+    # Imports from chuk_protocol_server
+    from chuk_protocol_server.servers.telnet_server import TelnetServer
+    from chuk_protocol_server.servers.tcp_server import TCPServer
+    from chuk_protocol_server.servers.ws_server_plain import PlainWebSocketServer
+    from chuk_protocol_server.servers.ws_telnet_server import WSTelnetServer
+
+    from telnet_proxy_server.proxy_handler import TelnetProxyHandler, build_path_targets
+
     logging.basicConfig(
         level=args.log_level.upper(),
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -184,6 +188,8 @@ async def start_server(args):
     
     if path_mappings:
         server.path_mappings = path_mappings
+    # Resolve mappings to (host, port) once here rather than on every connect
+    server.path_targets = build_path_targets(path_mappings)
     
     try:
         await server.start_server()
@@ -194,16 +200,29 @@ async def start_server(args):
     finally:
         logger.info("Telnet Proxy Server has shut down.")
 
+def use_fast_loop() -> bool:
+    """
+    Install uvloop (winloop on Windows) as the asyncio event loop policy if available.
+    Both are optional extras: pip install "telnet-proxy-server[fast]".
+    Returns True if a fast loop was installed.
+    """
+    try:
+        if sys.platform == 'win32':
+            import winloop as fast_loop
+        else:
+            import uvloop as fast_loop
+    except ImportError:
+        logger.info("uvloop/winloop not available, using standard asyncio event loop")
+        return False
+    fast_loop.install()
+    logger.info(f"Using {fast_loop.__name__} for improved performance")
+    return True
+
 def main():
     """Main entry point for the telnet proxy service."""
     args = parse_arguments()
     try:
-        try:
-            import uvloop
-            uvloop.install()
-            logger.info("Using uvloop for improved performance")
-        except ImportError:
-            logger.info("uvloop not available, using standard asyncio event loop")
+        use_fast_loop()
         asyncio.run(start_server(args))
     except KeyboardInterrupt:
         print("\nTelnet Proxy is shutting down gracefully...")